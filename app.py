@@ -8,8 +8,12 @@ from flask import (
     session,
 )
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.extensions import cache
+from app.overload import load_shedder
+
 # ---------------------------
 # Flask App Setup
 # ---------------------------
@@ -22,7 +26,13 @@ app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
     "DATABASE_URL", "sqlite:///site.db"
 )
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+app.config["CACHE_TYPE"] = os.environ.get("CACHE_TYPE", "SimpleCache")
+# Overload protection (see config.py for the thresholds and the
+# X-Request-Start proxy header it relies on)
+app.config["OVERLOAD_CACHEABLE_ENDPOINTS"] = ("about",)
 db = SQLAlchemy(app)
+cache.init_app(app)
+load_shedder.init_app(app)
 
 
 # ---------------------------
@@ -32,6 +42,8 @@ class SiteVisitor(db.Model):
     __tablename__ = "site_visitors"
     id = db.Column(db.Integer, primary_key=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # 1 / sampling rate; > 1 for visits recorded while load shedding
+    sample_weight = db.Column(db.Float, nullable=False, default=1.0, server_default="1")
 
     def __repr__(self):
         return f"<SiteVisitor {self.id}>"
@@ -40,8 +52,8 @@ class SiteVisitor(db.Model):
 # ---------------------------
 # Initialize Database
 # ---------------------------
-with app.app_context():
-    db.create_all()
+# Tables are created when this file is run directly (`python app.py`, see
+# the bottom of the file), not at import time, so importing stays cheap.
 
 
 # ---------------------------
@@ -99,9 +111,16 @@ SERVICES = [
 # Helper Functions
 # ---------------------------
 def add_visitor():
-    """Add a new site visitor record safely."""
+    """Add a new site visitor record safely.
+
+    Under overload only a weighted sample of visits is written.
+    """
+    plan = load_shedder.tracking_plan(request.user_agent.string)
+    if plan is None:
+        return
+
     try:
-        visitor = SiteVisitor()
+        visitor = SiteVisitor(sample_weight=plan.sample_weight)
         db.session.add(visitor)
         db.session.commit()
     except SQLAlchemyError as e:
@@ -212,12 +231,17 @@ def health():
 @app.route("/visitors")
 def visitors():
     """Return total visitor count from DB."""
-    total_visitors = SiteVisitor.query.count()
-    return jsonify({"total_visitors": total_visitors})
+    # Sum sample weights so visits sampled out under load are still counted
+    total_visitors = db.session.query(
+        func.coalesce(func.sum(SiteVisitor.sample_weight), 0)
+    ).scalar()
+    return jsonify({"total_visitors": round(total_visitors)})
 
 
 # ---------------------------
 # Run the App
 # ---------------------------
 if __name__ == "__main__":
+    with app.app_context():
+        db.create_all()
     app.run(debug=True, host="0.0.0.0", port=5000)
@@ -1,25 +1,40 @@
 # app/__init__.py (Project restructuring)
+#
+# Keep module-level imports cheap: importing the package (workers, CLI,
+# tests) should not pull in models, routes, Celery or GeoIP. Those load
+# inside create_app() or on first use. `flask startup-profile` checks this.
 from flask import Flask
 from config import Config
 from app.extensions import db, migrate, login_manager, cache
-from app.models import SiteVisitor, User, ContactMessage
-from app.routes import main, api
-from app.utils import validators, helpers
 
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    # Initialize extensions
+    # Initialize extensions (cache backend, Redis, GeoIP reader and Celery
+    # are created on first use, not here)
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     cache.init_app(app)
 
-    # Register blueprints
+    from app.overload import load_shedder
+
+    load_shedder.init_app(app)
+
+    # Register blueprints (these import the models)
+    from app.routes import main, api
+    from app import monitoring
+
     app.register_blueprint(main.bp)
     app.register_blueprint(api.bp, url_prefix="/api/v1")
+    app.register_blueprint(monitoring.bp)
+
+    # CLI commands
+    from app.cli import register_commands
+
+    register_commands(app)
 
     # Error handlers
     register_error_handlers(app)
@@ -0,0 +1,68 @@
+# app/extensions.py
+import threading
+
+from flask import current_app
+from flask_caching import Cache
+from flask_login import LoginManager
+from flask_migrate import Migrate
+from flask_sqlalchemy import SQLAlchemy
+
+
+class LazyCache(Cache):
+    """Flask-Caching Cache that builds its backend on first use.
+
+    init_app only records the config; the backend (and its client library,
+    e.g. redis) is created the first time the cache is touched, so worker
+    boot and CLI commands that never use the cache don't pay for it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_lock = threading.Lock()
+
+    def _set_cache(self, app, config):
+        app.extensions.setdefault("cache", {})
+        app.extensions.setdefault("lazy_cache_config", {})[self] = config
+
+    @property
+    def cache(self):
+        app = current_app or self.app
+        backends = app.extensions["cache"]
+        if self not in backends:
+            with self._init_lock:
+                if self not in backends:
+                    config = app.extensions["lazy_cache_config"][self]
+                    Cache._set_cache(self, app, config)
+        return backends[self]
+
+
+_MISSING = object()
+
+
+class LazyResource:
+    """Per-app resource created by ``factory(app)`` on first access.
+
+    The factory's result is cached even when it is None (e.g. GeoIP not
+    configured), so the factory runs once per app.
+    """
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self._lock = threading.Lock()
+
+    def get(self, app=None):
+        app = app or current_app._get_current_object()
+        resource = app.extensions.get(self.name, _MISSING)
+        if resource is _MISSING:
+            with self._lock:
+                resource = app.extensions.get(self.name, _MISSING)
+                if resource is _MISSING:
+                    resource = app.extensions[self.name] = self.factory(app)
+        return resource
+
+
+db = SQLAlchemy()
+migrate = Migrate()
+login_manager = LoginManager()
+cache = LazyCache()
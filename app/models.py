@@ -23,6 +23,8 @@ class SiteVisitor(db.Model):
     session_id = db.Column(db.String(100))
     is_bot = db.Column(db.Boolean, default=False)
     country = db.Column(db.String(2))
+    # 1 / sampling rate; > 1 for visits recorded while load shedding
+    sample_weight = db.Column(db.Float, nullable=False, default=1.0, server_default="1")
 
     # Indexes
     __table_args__ = (
@@ -38,7 +40,8 @@ class SiteVisitor(db.Model):
         return (
             db.session.query(
                 cast(cls.timestamp, Date).label("date"),
-                func.count(cls.id).label("count"),
+                func.sum(cls.sample_weight).label("count"),
+                # Lower bound on days with load shedding (sessions sampled out)
                 func.count(db.distinct(cls.session_id)).label("unique_visitors"),
             )
             .filter(cls.timestamp >= datetime.utcnow() - timedelta(days=days))
@@ -71,6 +74,7 @@ class ContactMessage(db.Model):
     )  # unread, read, replied, spam
     metadata = db.Column(JSONB)  # Store additional data
 
-    # For spam detection
+    # For spam detection (set by the spam model; status is human review)
     spam_score = db.Column(db.Float, default=0.0)
     is_spam = db.Column(db.Boolean, default=False)
+    scored_at = db.Column(db.DateTime, index=True)
@@ -1,7 +1,10 @@
 # app/monitoring.py
-from prometheus_client import Counter, Histogram, generate_latest
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
 import time
 from functools import wraps
+from flask import Blueprint, request
+
+bp = Blueprint("monitoring", __name__)
 
 # Metrics
 REQUEST_COUNT = Counter(
@@ -12,6 +15,17 @@ REQUEST_LATENCY = Histogram(
     "http_request_duration_seconds", "HTTP request latency", ["endpoint"]
 )
 
+# Overload protection (see app/overload.py)
+OVERLOAD_LEVEL = Gauge("overload_level", "Current load shedding level (0 = normal)")
+
+OVERLOAD_REQUESTS = Counter(
+    "overload_requests_total", "Requests seen per load shedding state", ["state"]
+)
+
+OVERLOAD_SHED = Counter(
+    "overload_shed_total", "Work shed under overload", ["state", "action"]
+)
+
 
 def monitor_request(f):
     """Decorator to monitor request metrics"""
@@ -38,7 +52,7 @@ def monitor_request(f):
     return decorated_function
 
 
-@app.route("/metrics")
+@bp.route("/metrics")
 def metrics():
     """Prometheus metrics endpoint"""
     return generate_latest(), 200, {"Content-Type": "text/plain"}
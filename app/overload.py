@@ -0,0 +1,271 @@
+# app/overload.py
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from flask import (
+    Response,
+    current_app,
+    g,
+    has_request_context,
+    jsonify,
+    request,
+)
+from flask.globals import request_ctx
+
+from app.extensions import cache
+from app.monitoring import OVERLOAD_LEVEL, OVERLOAD_REQUESTS, OVERLOAD_SHED
+
+# Degradation steps, in order. Each level includes the ones below it.
+NORMAL = 0
+SAMPLE_TRACKING = 1  # record only a weighted sample of visits
+SKIP_BOT_ENRICHMENT = 2  # no GeoIP / full bot detection for obvious bots
+SERVE_CACHED = 3  # answer GET pages from the overload page cache
+REJECT = 4  # 503 + Retry-After
+
+LEVEL_NAMES = (
+    "normal",
+    "sample_tracking",
+    "skip_bot_enrichment",
+    "serve_cached",
+    "reject",
+)
+
+KNOWN_BOT_MARKERS = (
+    "bot",
+    "crawl",
+    "spider",
+    "slurp",
+    "curl",
+    "wget",
+    "python-requests",
+)
+
+
+@dataclass
+class TrackingPlan:
+    sample_weight: float = 1.0
+    enrich: bool = True
+
+
+def _parse_request_start(value: str) -> Optional[float]:
+    """Parse an X-Request-Start header ("t=<epoch>" in s, ms or us)"""
+    try:
+        started = float(value.strip().lstrip("t="))
+    except ValueError:
+        return None
+    if started > 1e14:
+        return started / 1e6
+    if started > 1e11:
+        return started / 1e3
+    return started
+
+
+def is_known_bot(user_agent: Optional[str]) -> bool:
+    """Cheap substring check used instead of full bot detection under load"""
+    ua = (user_agent or "").lower()
+    return not ua or any(marker in ua for marker in KNOWN_BOT_MARKERS)
+
+
+def _session_accessed() -> bool:
+    # Read the session off the request context: going through the `session`
+    # proxy marks it accessed on newer Flask versions
+    ctx = vars(request_ctx._get_current_object())
+    current = ctx.get("_session", ctx.get("session"))
+    return current is not None and current.accessed
+
+
+class LoadShedder:
+    """Tracks in-flight requests and queue latency and degrades in steps"""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.queue_latency = 0.0  # EWMA, seconds
+        self.level = NORMAL
+        self._level_changed = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("OVERLOAD_ENABLED", True)
+        app.config.setdefault("OVERLOAD_INFLIGHT_THRESHOLDS", (32, 64, 96, 128))
+        app.config.setdefault(
+            "OVERLOAD_QUEUE_LATENCY_THRESHOLDS", (0.1, 0.25, 0.5, 1.0)
+        )
+        app.config.setdefault("OVERLOAD_SAMPLE_RATES", (1.0, 0.25, 0.1, 0.05, 0.0))
+        app.config.setdefault("OVERLOAD_COOLDOWN", 5.0)
+        app.config.setdefault("OVERLOAD_RETRY_AFTER", 30)
+        app.config.setdefault("OVERLOAD_PAGE_CACHE_TIMEOUT", 30)
+        app.config.setdefault("OVERLOAD_EXEMPT_ENDPOINTS", ("health", "metrics"))
+        # Only these public, session-independent pages are ever cached
+        app.config.setdefault("OVERLOAD_CACHEABLE_ENDPOINTS", ())
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions["load_shedder"] = self
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def _target_level(self, config) -> int:
+        level = NORMAL
+        for step, limit in enumerate(config["OVERLOAD_INFLIGHT_THRESHOLDS"], 1):
+            if self.in_flight >= limit:
+                level = step
+        for step, limit in enumerate(config["OVERLOAD_QUEUE_LATENCY_THRESHOLDS"], 1):
+            if self.queue_latency >= limit:
+                level = max(level, step)
+        return level
+
+    def _update_level(self, config) -> int:
+        """Escalate immediately, recover one step per cooldown period"""
+        now = time.monotonic()
+        target = self._target_level(config)
+        if target > self.level:
+            self.level = target
+            self._level_changed = now
+        elif (
+            target < self.level
+            and now - self._level_changed >= config["OVERLOAD_COOLDOWN"]
+        ):
+            self.level -= 1
+            self._level_changed = now
+        OVERLOAD_LEVEL.set(self.level)
+        return self.level
+
+    def _observe_queue_latency(self):
+        # Needs a proxy that stamps X-Request-Start (see config.py)
+        header = request.headers.get("X-Request-Start")
+        started = _parse_request_start(header) if header else None
+        if started is None:
+            return
+        latency = max(time.time() - started, 0.0)
+        self.queue_latency = 0.8 * self.queue_latency + 0.2 * latency
+
+    # ------------------------------------------------------------------
+    # Request hooks
+    # ------------------------------------------------------------------
+    def _exempt(self) -> bool:
+        endpoint = request.endpoint or ""
+        return (
+            endpoint.rsplit(".", 1)[-1]
+            in current_app.config["OVERLOAD_EXEMPT_ENDPOINTS"]
+        )
+
+    def _before_request(self):
+        config = current_app.config
+        if not config["OVERLOAD_ENABLED"]:
+            return None
+
+        with self._lock:
+            self.in_flight += 1
+            self._observe_queue_latency()
+            level = self._update_level(config)
+        g.overload_counted = True
+        g.overload_level = level
+        OVERLOAD_REQUESTS.labels(LEVEL_NAMES[level]).inc()
+
+        if self._exempt():
+            return None
+
+        if level >= REJECT:
+            OVERLOAD_SHED.labels(LEVEL_NAMES[level], "rejected").inc()
+            response = jsonify({"error": "Service temporarily overloaded"})
+            response.status_code = 503
+            response.headers["Retry-After"] = str(config["OVERLOAD_RETRY_AFTER"])
+            return response
+
+        if (
+            level >= SERVE_CACHED
+            and request.method == "GET"
+            and not request.query_string
+            and request.endpoint in config["OVERLOAD_CACHEABLE_ENDPOINTS"]
+        ):
+            cached = cache.get(self._page_cache_key())
+            if cached is not None:
+                OVERLOAD_SHED.labels(LEVEL_NAMES[level], "served_cached").inc()
+                g.overload_served_cached = True
+                body, status, mimetype = cached
+                return Response(body, status=status, mimetype=mimetype)
+
+        return None
+
+    def _cacheable(self, response) -> bool:
+        """Public page that is the same for every visitor"""
+        if request.endpoint not in current_app.config["OVERLOAD_CACHEABLE_ENDPOINTS"]:
+            return False
+        # Query strings would let a flood of ?r=<random> bypass the cache and
+        # fill it with one key per request
+        if request.query_string:
+            return False
+        if _session_accessed() or response.headers.get("Set-Cookie"):
+            return False
+        user = g.get("_login_user")  # set by Flask-Login once loaded
+        if user is not None and user.is_authenticated:
+            return False
+        return (
+            request.method == "GET"
+            and response.status_code == 200
+            and response.mimetype == "text/html"
+            and not response.direct_passthrough
+        )
+
+    def _after_request(self, response):
+        # Keep the page cache warm while degraded so SERVE_CACHED has hits
+        level = g.get("overload_level", NORMAL)
+        if (
+            level >= SAMPLE_TRACKING
+            and not g.get("overload_served_cached")
+            and self._cacheable(response)
+        ):
+            # add() never overwrites, so each key is written once per timeout
+            cache.add(
+                self._page_cache_key(),
+                (response.get_data(), response.status_code, response.mimetype),
+                timeout=current_app.config["OVERLOAD_PAGE_CACHE_TIMEOUT"],
+            )
+        return response
+
+    def _teardown_request(self, exc=None):
+        if g.pop("overload_counted", False):
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def _page_cache_key() -> str:
+        return f"overload_page:{request.path}"
+
+    # ------------------------------------------------------------------
+    # Visitor tracking
+    # ------------------------------------------------------------------
+    def tracking_plan(self, user_agent: Optional[str]) -> Optional[TrackingPlan]:
+        """Decide how to track the current visit, or None to skip it.
+
+        Kept visits carry sample_weight = 1 / sample_rate so that summing
+        weights gives an unbiased estimate of the true visit count.
+        """
+        if not has_request_context():
+            return TrackingPlan()
+
+        level = g.get("overload_level", NORMAL)
+        if level == NORMAL:
+            return TrackingPlan()
+
+        state = LEVEL_NAMES[level]
+        rate = current_app.config["OVERLOAD_SAMPLE_RATES"][level]
+        if rate <= 0 or random.random() >= rate:
+            OVERLOAD_SHED.labels(state, "tracking_sampled_out").inc()
+            return None
+
+        enrich = True
+        if level >= SKIP_BOT_ENRICHMENT and is_known_bot(user_agent):
+            OVERLOAD_SHED.labels(state, "bot_enrichment_skipped").inc()
+            enrich = False
+        return TrackingPlan(sample_weight=1.0 / rate, enrich=enrich)
+
+
+load_shedder = LoadShedder()
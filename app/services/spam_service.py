@@ -0,0 +1,270 @@
+# app/services/spam_service.py
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import current_app
+
+DEFAULT_N_FEATURES = 2**18
+DEFAULT_NGRAM_RANGE = (1, 2)
+
+# Bytes that separate tokens: ASCII whitespace, NUL (joins the texts of a
+# batch) and punctuation. $, @, ., / and : are kept so prices, e-mail
+# addresses and URLs survive as features; non-ASCII bytes are token bytes.
+_IS_SEPARATOR = np.zeros(256, dtype=bool)
+_IS_SEPARATOR[list(b"\x00\t\n\v\f\r ,;!?()[]{}<>\"'*`|~^=+#%&")] = True
+# ...but stripped from the end of a token, so "prize." counts as "prize"
+_IS_TRAILING_PUNCTUATION = np.zeros(256, dtype=bool)
+_IS_TRAILING_PUNCTUATION[list(b".:/")] = True
+
+# Token hashes are polynomial hashes of their UTF-8 bytes mod 2**32. The base
+# is odd, so it has an inverse and hash(buf[s:e]) = P**(e-1) * (C[e] - C[s])
+# where C is the prefix sum of buf[j] * P**-j; every token in the batch is
+# hashed with a handful of array operations.
+_HASH_BASE = 0x01000193
+_HASH_BASE_INV = pow(_HASH_BASE, -1, 2**32)
+_NGRAM_MULTIPLIER = np.uint64(1000003)
+_HASH_MASK = np.uint64(0xFFFFFFFF)
+
+# P**j and P**-j for j < len(table); grown on demand to the largest batch
+_power_tables = (np.ones(1, dtype=np.uint32), np.ones(1, dtype=np.uint32))
+
+
+def _power_table(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    global _power_tables
+    powers, inverse_powers = _power_tables
+    if len(powers) <= n:
+        size = max(n + 1, 2 * len(powers))
+        tables = []
+        for base in (_HASH_BASE, _HASH_BASE_INV):
+            table = np.ones(size, dtype=np.uint32)
+            np.cumprod(np.full(size - 1, base, dtype=np.uint32), out=table[1:])
+            tables.append(table)
+        _power_tables = powers, inverse_powers = tuple(tables)
+    return powers, inverse_powers
+
+
+def _mix32(h: np.ndarray) -> np.ndarray:
+    """murmur3 finaliser, so the low bits used for bucketing see every byte"""
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x85EBCA6B)
+    h ^= h >> np.uint32(13)
+    h *= np.uint32(0xC2B2AE35)
+    h ^= h >> np.uint32(16)
+    return h
+
+
+def _token_hashes(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (32-bit token hash, text index) for every token in the batch"""
+    joined = "\x00".join((text or "").replace("\x00", " ") for text in texts)
+    buf = np.frombuffer(joined.lower().encode("utf-8", "replace"), dtype=np.uint8)
+    powers, inverse_powers = _power_table(len(buf))
+
+    in_token = np.concatenate(([False], ~_IS_SEPARATOR[buf], [False]))
+    edges = np.diff(in_token.view(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # Runs of trailing punctuation are short, so a few passes strip them all
+    trailing = _IS_TRAILING_PUNCTUATION[buf[ends - 1]]
+    while trailing.any():
+        ends[trailing] -= 1
+        trailing[trailing] = ends[trailing] > starts[trailing]
+        trailing[trailing] = _IS_TRAILING_PUNCTUATION[buf[ends[trailing] - 1]]
+    nonempty = ends > starts
+    starts, ends = starts[nonempty], ends[nonempty]
+    rows = np.searchsorted(np.flatnonzero(buf == 0), starts)
+
+    prefix = np.zeros(len(buf) + 1, dtype=np.uint32)
+    np.cumsum(buf * inverse_powers[: len(buf)], out=prefix[1:], dtype=np.uint32)
+    hashes = powers[ends - 1] * (prefix[ends] - prefix[starts])
+    return _mix32(hashes).astype(np.uint64), rows.astype(np.int64)
+
+
+def hash_features(
+    texts: Sequence[str],
+    n_features: int = DEFAULT_N_FEATURES,
+    ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Hash a batch of texts into sparse (row, column) index arrays.
+
+    Every n-gram occurrence becomes one (row, column) pair, so counts are
+    implicit and the batch never has to be materialised as a dense matrix.
+    Longer n-grams are combined from the unigram hashes.
+    """
+    hashes, rows = _token_hashes(texts)
+
+    low, high = ngram_range
+    row_parts, col_parts = [], []
+    grams = hashes
+    for n in range(1, high + 1):
+        if n > 1:
+            # grams[i] covers tokens i..i+n-1; drop those that cross a text boundary
+            grams = (grams[:-1] * _NGRAM_MULTIPLIER ^ hashes[n - 1 :]) & _HASH_MASK
+        if n >= low:
+            start_rows = rows[: len(grams)]
+            same_text = start_rows == rows[n - 1 :]
+            row_parts.append(start_rows[same_text])
+            col_parts.append(grams[same_text])
+
+    cols = (np.concatenate(col_parts) % np.uint64(n_features)).astype(np.int64)
+    return np.concatenate(row_parts), cols
+
+
+@dataclass
+class SpamModel:
+    """Multinomial naive Bayes over hashed n-gram counts"""
+
+    weights: np.ndarray  # log P(f|spam) - log P(f|ham), shape (n_features,)
+    bias: float  # log P(spam) - log P(ham)
+    n_features: int = DEFAULT_N_FEATURES
+    ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[bool],
+        n_features: int = DEFAULT_N_FEATURES,
+        ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+        alpha: float = 1.0,
+    ) -> "SpamModel":
+        """Fit the model on labelled texts (True = spam)"""
+        y = np.asarray(labels, dtype=bool)
+        if len(texts) != len(y):
+            raise ValueError("texts and labels must have the same length")
+        if y.all() or not y.any():
+            raise ValueError("training data needs both spam and ham examples")
+
+        rows, cols = hash_features(texts, n_features, ngram_range)
+        is_spam = y[rows]
+        spam_counts = np.bincount(cols[is_spam], minlength=n_features) + alpha
+        ham_counts = np.bincount(cols[~is_spam], minlength=n_features) + alpha
+
+        weights = np.log(spam_counts / spam_counts.sum()) - np.log(
+            ham_counts / ham_counts.sum()
+        )
+        bias = float(np.log(y.sum()) - np.log((~y).sum()))
+        return cls(
+            weights=weights.astype(np.float32),
+            bias=bias,
+            n_features=n_features,
+            ngram_range=tuple(ngram_range),
+        )
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """Return P(spam) for each text in the batch"""
+        rows, cols = hash_features(texts, self.n_features, self.ngram_range)
+        log_odds = self.bias + np.bincount(
+            rows, weights=self.weights[cols], minlength=len(texts)
+        )
+        return 1.0 / (1.0 + np.exp(-np.clip(log_odds, -50, 50)))
+
+    def save(self, path: str) -> None:
+        """Write the model atomically so a running scorer never reads a partial file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            np.savez_compressed(
+                fh,
+                weights=self.weights,
+                bias=np.float64(self.bias),
+                n_features=np.int64(self.n_features),
+                ngram_range=np.asarray(self.ngram_range, dtype=np.int64),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SpamModel":
+        with np.load(path) as data:
+            return cls(
+                weights=data["weights"],
+                bias=float(data["bias"]),
+                n_features=int(data["n_features"]),
+                ngram_range=tuple(int(n) for n in data["ngram_range"]),
+            )
+
+
+class SpamScorer:
+    """Scores messages with the model on disk, reloading it when the file changes"""
+
+    def __init__(self, model_path: str, reload_interval: float = 30.0):
+        self.model_path = model_path
+        self.reload_interval = reload_interval
+        self._model: Optional[SpamModel] = None
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> Optional[SpamModel]:
+        self._maybe_reload()
+        return self._model
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if self._model is not None and now - self._last_check < self.reload_interval:
+            return
+
+        with self._lock:
+            self._last_check = now
+            try:
+                mtime = os.stat(self.model_path).st_mtime
+            except FileNotFoundError:
+                return
+            if mtime != self._mtime:
+                self._model = SpamModel.load(self.model_path)
+                self._mtime = mtime
+
+    def score_batch(self, texts: Iterable[str]) -> np.ndarray:
+        """Return P(spam) per text; all zeros until a model has been trained"""
+        texts = list(texts)
+        model = self.model
+        if model is None:
+            return np.zeros(len(texts))
+        return model.score(texts)
+
+    def score(self, text: str) -> float:
+        return float(self.score_batch([text])[0])
+
+
+_scorers = {}
+
+
+def get_scorer(app=None) -> SpamScorer:
+    """Return the process-wide scorer for the app's configured model path"""
+    app = app or current_app
+    path = app.config.get("SPAM_MODEL_PATH", "instance/spam_model.npz")
+    scorer = _scorers.get(path)
+    if scorer is None:
+        scorer = _scorers[path] = SpamScorer(
+            path, app.config.get("SPAM_RELOAD_INTERVAL", 30.0)
+        )
+    return scorer
+
+
+def check_spam(message: str) -> float:
+    """Spam probability for a single message"""
+    return get_scorer().score(message)
+
+
+def score_contact_messages(messages: Sequence[Any]) -> None:
+    """Score ContactMessage rows in one batch and set spam_score/is_spam/scored_at"""
+    scorer = get_scorer()
+    if scorer.model is None:
+        # Leave rows unscored so they're picked up once a model is trained
+        return
+
+    threshold = current_app.config.get("SPAM_THRESHOLD", 0.8)
+    scores = scorer.score_batch(m.message for m in messages)
+    scored_at = datetime.utcnow()
+    for message, score in zip(messages, scores):
+        message.spam_score = float(score)
+        message.is_spam = bool(score >= threshold)
+        message.scored_at = scored_at
@@ -1,8 +1,10 @@
 # app/services/visitor_service.py
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
+from sqlalchemy import func
 from app.models import SiteVisitor
 from app.extensions import db
+from app.overload import load_shedder
 from app.utils.geoip import get_geo_location
 from app.utils.user_agent import detect_bot
 
@@ -19,14 +21,24 @@ class VisitorService:
     def __init__(self, db_session):
         self.db = db_session
 
-    def track_visitor(self, visitor_data: VisitorData) -> SiteVisitor:
-        """Track visitor with enhanced data collection"""
+    def track_visitor(self, visitor_data: VisitorData) -> Optional[SiteVisitor]:
+        """Track visitor with enhanced data collection.
 
-        # Bot detection
-        is_bot = detect_bot(visitor_data.user_agent)
+        Under overload only a weighted sample of visits is stored (None is
+        returned for the rest) and known bots skip enrichment.
+        """
+        plan = load_shedder.tracking_plan(visitor_data.user_agent)
+        if plan is None:
+            return None
 
-        # GeoIP lookup (async or cached)
-        country = get_geo_location(visitor_data.ip_address)
+        if plan.enrich:
+            # Bot detection
+            is_bot = detect_bot(visitor_data.user_agent)
+
+            # GeoIP lookup (async or cached)
+            country = get_geo_location(visitor_data.ip_address)
+        else:
+            is_bot, country = True, None
 
         visitor = SiteVisitor(
             ip_address=visitor_data.ip_address,
@@ -35,6 +47,7 @@ class VisitorService:
             session_id=visitor_data.session_id,
             is_bot=is_bot,
             country=country,
+            sample_weight=plan.sample_weight,
         )
 
         self.db.session.add(visitor)
@@ -44,14 +57,23 @@ class VisitorService:
 
     def get_visitor_statistics(self, days: int = 30) -> Dict[str, Any]:
         """Get comprehensive visitor statistics"""
-        total = SiteVisitor.query.count()
+        # Sum sample weights rather than counting rows so sampled periods
+        # still give unbiased totals
+        weighted = func.coalesce(func.sum(SiteVisitor.sample_weight), 0.0)
+        total = round(self.db.session.query(weighted).scalar())
+        # Distinct sessions can't be reweighted: while shedding is active
+        # sampled-out sessions are missing, so this is a lower bound
         unique = SiteVisitor.query.distinct(SiteVisitor.session_id).count()
         daily_stats = SiteVisitor.get_daily_visitors(days)
-        bots = SiteVisitor.query.filter_by(is_bot=True).count()
+        bots = round(
+            self.db.session.query(weighted)
+            .filter(SiteVisitor.is_bot.is_(True))
+            .scalar()
+        )
 
         return {
             "total_visitors": total,
-            "unique_visitors": unique,
+            "unique_visitors": unique,  # lower bound under load shedding
             "bot_visitors": bots,
             "daily_stats": daily_stats,
             "human_visitors": total - bots,
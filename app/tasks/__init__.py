@@ -1,26 +1,36 @@
 # app/tasks/__init__.py
-from celery import Celery
-from flask import current_app
+from celery import Celery, Task
+from flask import current_app, has_app_context
 import requests
 from app.services.email_service import send_contact_email
+from app.services.spam_service import score_contact_messages
 
 
-def make_celery(app):
-    """Initialize Celery with Flask context"""
-    celery = Celery(
-        app.import_name,
-        backend=app.config["CELERY_RESULT_BACKEND"],
-        broker=app.config["CELERY_BROKER_URL"],
-    )
-    celery.conf.update(app.config)
+class FlaskTask(Task):
+    """Run tasks inside a Flask app context.
+
+    Inside a request the current app is reused; in a worker the app is
+    created on the first task rather than when the worker imports tasks.
+    """
+
+    _flask_app = None
 
-    class ContextTask(celery.Task):
-        def __call__(self, *args, **kwargs):
-            with app.app_context():
-                return self.run(*args, **kwargs)
+    def __call__(self, *args, **kwargs):
+        if has_app_context():
+            return self.run(*args, **kwargs)
+        if FlaskTask._flask_app is None:
+            from app import create_app
 
-    celery.Task = ContextTask
-    return celery
+            FlaskTask._flask_app = create_app()
+        with FlaskTask._flask_app.app_context():
+            return self.run(*args, **kwargs)
+
+
+# Celery reads its configuration lazily, on first use (CELERY_BROKER_URL ->
+# broker_url, CELERY_RESULT_BACKEND -> result_backend). Nothing imports this
+# module at app start-up; views import tasks when they enqueue one.
+celery = Celery(__name__, task_cls=FlaskTask)
+celery.config_from_object("config:Config", namespace="CELERY")
 
 
 @celery.task(bind=True, max_retries=3)
@@ -33,14 +43,35 @@ def process_contact_form(self, form_data):
         # Log to analytics
         log_contact_to_analytics(form_data)
 
-        # Check for spam
-        spam_score = check_spam(form_data["message"])
-
-        return {"status": "processed", "spam_score": spam_score}
+        # Spam scoring happens in batches (score_unscored_messages on the
+        # beat schedule), not one message at a time here
+        return {"status": "processed"}
     except Exception as exc:
         self.retry(exc=exc, countdown=60)
 
 
+@celery.task
+def score_unscored_messages(batch_size=5000):
+    """Batch-score contact messages the spam model hasn't seen yet.
+
+    Only spam_score/is_spam/scored_at are set; status is left to human
+    review so `flask spam train` never learns from the model's own output.
+    """
+    from app.extensions import db
+    from app.models import ContactMessage
+
+    messages = (
+        ContactMessage.query.filter(ContactMessage.scored_at.is_(None))
+        .order_by(ContactMessage.id)
+        .limit(batch_size)
+        .all()
+    )
+    score_contact_messages(messages)
+    db.session.commit()
+
+    return {"scored": len(messages), "spam": sum(m.is_spam for m in messages)}
+
+
 # In your route:
 @app.route("/api/contact", methods=["POST"])
 @rate_limit(max_per_minute=10)
@@ -4,6 +4,17 @@ from flask import current_app
 import pickle
 import hashlib
 
+from app.extensions import LazyResource, cache
+
+
+def _connect_redis(app):
+    import redis
+
+    return redis.Redis.from_url(app.config["REDIS_URL"])
+
+
+redis_connection = LazyResource("redis", _connect_redis)
+
 
 def cached(timeout=300, key_prefix="view/"):
     """Advanced caching decorator with automatic invalidation"""
@@ -40,8 +51,13 @@ def cached(timeout=300, key_prefix="view/"):
 class RedisCache:
     """Custom Redis cache implementation"""
 
-    def __init__(self, redis_client):
-        self.redis = redis_client
+    def __init__(self, redis_client=None):
+        self._redis = redis_client
+
+    @property
+    def redis(self):
+        # Fall back to the app's shared client, created on first use
+        return self._redis or redis_connection.get()
 
     def get_or_set(self, key, callback, timeout=300):
         """Get from cache or set using callback"""
@@ -0,0 +1,37 @@
+# app/utils/geoip.py
+from functools import lru_cache
+from typing import Optional
+
+from app.extensions import LazyResource
+
+
+def _open_reader(app):
+    """Open the GeoLite2 database, or None if it isn't configured"""
+    path = app.config.get("GEOIP_DATABASE_PATH")
+    if not path:
+        return None
+
+    import geoip2.database
+
+    return geoip2.database.Reader(path)
+
+
+geoip_reader = LazyResource("geoip_reader", _open_reader)
+
+
+@lru_cache(maxsize=10000)
+def _lookup_country(reader, ip_address: str) -> Optional[str]:
+    from geoip2.errors import AddressNotFoundError
+
+    try:
+        return reader.country(ip_address).country.iso_code
+    except (AddressNotFoundError, ValueError):
+        return None
+
+
+def get_geo_location(ip_address: Optional[str]) -> Optional[str]:
+    """ISO country code for an IP address; the reader is opened on first call"""
+    reader = geoip_reader.get()
+    if reader is None or not ip_address:
+        return None
+    return _lookup_country(reader, ip_address)
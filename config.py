@@ -1,5 +1,6 @@
 # config.py
 import os
+import secrets
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -29,6 +30,43 @@ class Config:
     CELERY_RESULT_BACKEND = os.environ.get(
         "CELERY_RESULT_BACKEND", "redis://localhost:6379/1"
     )
+    CELERY_BEAT_SCHEDULE = {
+        # Score new contact messages in one vectorised batch
+        "score-unscored-messages": {
+            "task": "app.tasks.score_unscored_messages",
+            "schedule": float(os.environ.get("SPAM_SCORING_INTERVAL", 60)),
+        },
+    }
+
+    # Spam scoring
+    SPAM_MODEL_PATH = os.environ.get("SPAM_MODEL_PATH", "instance/spam_model.npz")
+    SPAM_THRESHOLD = float(os.environ.get("SPAM_THRESHOLD", 0.8))
+    SPAM_RELOAD_INTERVAL = 30  # seconds between model file mtime checks
+
+    # Overload protection: thresholds for levels 1-4 (sample tracking,
+    # skip bot enrichment, serve cached pages, reject with 503).
+    #
+    # Queue latency is read from the X-Request-Start header ("t=<epoch>"),
+    # which the reverse proxy must add, e.g. in nginx:
+    #     proxy_set_header X-Request-Start "t=${msec}";
+    # Without it only the per-process in-flight count is used, which never
+    # exceeds 1 with sync workers, so shedding would never start. Use a
+    # threaded/async worker class or configure the header.
+    OVERLOAD_ENABLED = True
+    OVERLOAD_INFLIGHT_THRESHOLDS = (32, 64, 96, 128)  # per process
+    OVERLOAD_QUEUE_LATENCY_THRESHOLDS = (0.1, 0.25, 0.5, 1.0)  # seconds
+    OVERLOAD_SAMPLE_RATES = (1.0, 0.25, 0.1, 0.05, 0.0)  # per level
+    OVERLOAD_COOLDOWN = 5.0  # seconds before stepping down one level
+    OVERLOAD_RETRY_AFTER = 30
+    OVERLOAD_EXEMPT_ENDPOINTS = ("health", "metrics")  # never shed
+    OVERLOAD_PAGE_CACHE_TIMEOUT = 30  # seconds
+    OVERLOAD_CACHEABLE_ENDPOINTS = ("main.about",)
+
+    # Cold start budget checked by `flask startup-profile`
+    STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", 1500))
+
+    # GeoIP (reader is opened on first lookup)
+    GEOIP_DATABASE_PATH = os.environ.get("GEOIP_DATABASE_PATH")
 
     # Security
     SESSION_COOKIE_SECURE = os.environ.get("FLASK_ENV") == "production"
@@ -0,0 +1,68 @@
+"""create site_visitors and contact_messages
+
+Revision ID: 1a0d5c3b9f28
+Revises:
+Create Date: 2026-10-19 14:45:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1a0d5c3b9f28"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "site_visitors",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("visitor_uuid", sa.String(length=36), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+        sa.Column("page_visited", sa.String(length=100), nullable=True),
+        sa.Column("session_id", sa.String(length=100), nullable=True),
+        sa.Column("is_bot", sa.Boolean(), nullable=True),
+        sa.Column("country", sa.String(length=2), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("visitor_uuid"),
+    )
+    op.create_index("ix_site_visitors_timestamp", "site_visitors", ["timestamp"])
+    op.create_index("idx_visitor_timestamp", "site_visitors", ["timestamp"])
+    op.create_index("idx_visitor_session", "site_visitors", ["session_id"])
+
+    op.create_table(
+        "contact_messages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=120), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column(
+            "metadata",
+            sa.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+            nullable=True,
+        ),
+        sa.Column("spam_score", sa.Float(), nullable=True),
+        sa.Column("is_spam", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_contact_messages_email", "contact_messages", ["email"])
+    op.create_index("ix_contact_messages_status", "contact_messages", ["status"])
+
+
+def downgrade():
+    op.drop_index("ix_contact_messages_status", table_name="contact_messages")
+    op.drop_index("ix_contact_messages_email", table_name="contact_messages")
+    op.drop_table("contact_messages")
+    op.drop_index("idx_visitor_session", table_name="site_visitors")
+    op.drop_index("idx_visitor_timestamp", table_name="site_visitors")
+    op.drop_index("ix_site_visitors_timestamp", table_name="site_visitors")
+    op.drop_table("site_visitors")
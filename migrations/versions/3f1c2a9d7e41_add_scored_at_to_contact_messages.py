@@ -0,0 +1,28 @@
+"""add scored_at to contact_messages
+
+Revision ID: 3f1c2a9d7e41
+Revises: 1a0d5c3b9f28
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "3f1c2a9d7e41"
+down_revision = "1a0d5c3b9f28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("contact_messages") as batch_op:
+        batch_op.add_column(sa.Column("scored_at", sa.DateTime(), nullable=True))
+        batch_op.create_index("ix_contact_messages_scored_at", ["scored_at"])
+
+
+def downgrade():
+    with op.batch_alter_table("contact_messages") as batch_op:
+        batch_op.drop_index("ix_contact_messages_scored_at")
+        batch_op.drop_column("scored_at")
@@ -0,0 +1,29 @@
+"""add sample_weight to site_visitors
+
+Revision ID: 8b5e0c4f2d17
+Revises: 3f1c2a9d7e41
+Create Date: 2026-10-19 15:30:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "8b5e0c4f2d17"
+down_revision = "3f1c2a9d7e41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows were recorded unsampled, so they get weight 1
+    with op.batch_alter_table("site_visitors") as batch_op:
+        batch_op.add_column(
+            sa.Column("sample_weight", sa.Float(), nullable=False, server_default="1")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("site_visitors") as batch_op:
+        batch_op.drop_column("sample_weight")
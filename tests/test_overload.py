@@ -0,0 +1,76 @@
+# tests/test_overload.py
+import pytest
+from unittest.mock import patch
+from flask import Flask, g, session
+from app.extensions import cache
+from app.overload import SAMPLE_TRACKING, LoadShedder, load_shedder
+
+
+class TestLoadShedder:
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+        app.config.update(
+            SECRET_KEY="test",
+            CACHE_TYPE="SimpleCache",
+            OVERLOAD_CACHEABLE_ENDPOINTS=("about",),
+        )
+        cache.init_app(app)
+        LoadShedder().init_app(app)
+        return app
+
+    def test_sampled_visits_are_reweighted(self, app):
+        with app.test_request_context("/"):
+            g.overload_level = SAMPLE_TRACKING
+            with patch("app.overload.random.random", return_value=0.1):
+                plan = load_shedder.tracking_plan("Mozilla/5.0")
+            with patch("app.overload.random.random", return_value=0.9):
+                assert load_shedder.tracking_plan("Mozilla/5.0") is None
+
+        assert plan.sample_weight == 4.0
+        assert plan.enrich is True
+
+    def test_rejects_with_retry_after(self, app):
+        app.config["OVERLOAD_INFLIGHT_THRESHOLDS"] = (0, 0, 0, 0)
+        app.add_url_rule("/", "home", lambda: "ok")
+
+        response = app.test_client().get("/")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "30"
+
+    def test_serves_only_allowlisted_session_free_pages_from_cache(self, app):
+        app.config["OVERLOAD_INFLIGHT_THRESHOLDS"] = (0, 0, 0, 10**6)
+        renders = {"about": 0, "account": 0}
+
+        def about():
+            renders["about"] += 1
+            return "<p>about</p>"
+
+        def account():
+            renders["account"] += 1
+            return f"<p>{session.get('user', 'anon')}</p>"
+
+        app.add_url_rule("/about", "about", about)
+        app.add_url_rule("/account", "account", account)
+        app.config["OVERLOAD_CACHEABLE_ENDPOINTS"] += ("account",)
+        client = app.test_client()
+
+        for _ in range(3):
+            assert client.get("/about").status_code == 200
+            assert client.get("/account").status_code == 200
+
+        assert renders == {"about": 1, "account": 3}
+
+    def test_query_strings_bypass_the_page_cache(self, app):
+        app.config["OVERLOAD_INFLIGHT_THRESHOLDS"] = (0, 0, 0, 10**6)
+        renders = []
+        app.add_url_rule("/about", "about", lambda: renders.append(1) or "<p/>")
+        client = app.test_client()
+
+        for i in range(3):
+            client.get(f"/about?r={i}")
+
+        assert len(renders) == 3
+        with app.app_context():
+            assert cache.get("overload_page:/about") is None
@@ -0,0 +1,53 @@
+# tests/test_spam.py
+import numpy as np
+import pytest
+from app.services.spam_service import SpamModel, SpamScorer, hash_features
+
+
+class TestHashFeatures:
+    def test_batch_matches_single_texts(self):
+        texts = ["Win a FREE prize!", "", "quote for café.example/menu"]
+
+        rows, cols = hash_features(texts, n_features=2**10)
+
+        for i, text in enumerate(texts):
+            _, single = hash_features([text], n_features=2**10)
+            assert sorted(cols[rows == i]) == sorted(single)
+
+    def test_trailing_punctuation_is_stripped(self):
+        _, cols = hash_features(["prize.", "prize", "now:", "now"], n_features=2**10)
+
+        assert cols[0] == cols[1]
+        assert cols[2] == cols[3]
+
+    def test_bigrams_do_not_cross_texts(self):
+        rows, cols = hash_features(["a b", "c"], n_features=2**10)
+
+        # a, b, "a b" for the first text; c for the second
+        assert np.bincount(rows).tolist() == [3, 1]
+
+
+class TestSpamModel:
+    @pytest.fixture
+    def model(self):
+        texts = [
+            "free crypto prize click now",
+            "cheap casino offer winner",
+            "could you send a quote for the website",
+            "thanks for the meeting, question about the design",
+        ]
+        return SpamModel.train(texts, [True, True, False, False], n_features=2**10)
+
+    def test_scores_batch(self, model):
+        scores = model.score(["claim your free prize", "quote for a website design"])
+
+        assert scores.shape == (2,)
+        assert scores[0] > 0.5 > scores[1]
+
+    def test_scorer_reloads_changed_model(self, model, tmp_path):
+        path = str(tmp_path / "spam_model.npz")
+        scorer = SpamScorer(path, reload_interval=0)
+        assert scorer.score("free prize") == 0.0
+
+        model.save(path)
+        assert scorer.score("free prize") > 0.5
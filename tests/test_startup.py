@@ -0,0 +1,72 @@
+# tests/test_startup.py
+import os
+import subprocess
+import sys
+from unittest.mock import Mock
+from flask import Flask
+from app.cli import parse_importtime
+from app.extensions import LazyResource
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only load inside create_app() or on first use
+DEFERRED_MODULES = (
+    "app.models",
+    "app.routes",
+    "app.tasks",
+    "app.overload",
+    "celery",
+    "redis",
+    "geoip2",
+    "numpy",
+)
+
+
+class TestStartup:
+    def test_import_app_does_not_load_deferred_modules(self):
+        code = (
+            "import sys, app\n"
+            f"print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_ROOT,
+            check=True,
+        )
+
+        assert result.stdout.split() == []
+
+    def test_lazy_resource_created_once_on_first_use(self):
+        factory = Mock(side_effect=lambda app: object())
+        resource = LazyResource("thing", factory)
+        app = Flask(__name__)
+        factory.assert_not_called()
+
+        with app.app_context():
+            assert resource.get() is resource.get()
+        factory.assert_called_once_with(app)
+
+    def test_lazy_resource_caches_none(self):
+        factory = Mock(return_value=None)
+        resource = LazyResource("geoip_reader", factory)
+        app = Flask(__name__)
+
+        with app.app_context():
+            assert resource.get() is None
+            assert resource.get() is None
+        factory.assert_called_once_with(app)
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       502 |       1270 |   json.decoder\n"
+            "import time:       320 |       2103 | json\n"
+        )
+
+        assert parse_importtime(output) == [
+            ("json.decoder", 502, 1270),
+            ("json", 320, 2103),
+        ]